@@ -20,7 +20,7 @@ try:
 except ImportError:
     ssl = None
 
-from multiprocessing import Process, Manager, Queue, pool
+from multiprocessing import Process, Queue, pool
 from threading import RLock, Thread
 
 try:
@@ -35,9 +35,7 @@ except ImportError:
     from urllib2 import Request, urlopen, HTTPError, URLError, ProxyHandler, HTTPSHandler, build_opener
     from urllib import urlencode, unquote_plus, quote
 
-    base64.encodebytes = base64.encodestring
-
-from .commons import synchronized_with_attr, truncate, python_version_bellow
+from .commons import synchronized_with_attr, python_version_bellow, LazyTruncate
 from .params import group_key, parse_key, is_valid
 from .files import read_file_str, save_file, delete_file
 from .exception import NacosException, NacosRequestException
@@ -47,12 +45,20 @@ from .timer import NacosTimer, NacosTimerManager
 logger = logging.getLogger(__name__)
 
 VERSION = "0.1.15"
+USER_AGENT = "Nacos-Python-Client:v" + VERSION
 
 DEFAULT_GROUP_NAME = "DEFAULT_GROUP"
 DEFAULT_NAMESPACE = ""
 ADDRESS_SERVER_TIMEOUT = 3
 WORD_SEPARATOR = u'\x02'
 LINE_SEPARATOR = u'\x01'
+# hmac.digest is a C-implemented one-shot path, available since python3.7
+HMAC_DIGEST_SUPPORTED = not python_version_bellow("3.7")
+PYTHON_BELOW_3 = python_version_bellow("3")
+PYTHON_BELOW_2_7_5 = python_version_bellow("2.7.5")
+# server errors on which the request is retried against the next server
+RETRYABLE_HTTP_STATUS = frozenset([HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.BAD_GATEWAY,
+                                   HTTPStatus.SERVICE_UNAVAILABLE])
 
 DEFAULTS = {
     "APP_NAME": "Nacos-SDK-Python",
@@ -69,7 +75,7 @@ OPTIONS = {"default_timeout", "pulling_timeout", "pulling_config_size", "callbac
 
 
 def process_common_config_params(data_id, group):
-    if not group or not group.strip():
+    if not group or group.isspace():
         group = DEFAULT_GROUP_NAME
     else:
         group = group.strip()
@@ -87,7 +93,7 @@ def parse_pulling_result(result):
         return list()
     ret = list()
     for i in unquote_plus(result.decode()).split(LINE_SEPARATOR):
-        if not i.strip():
+        if not i or i.isspace():
             continue
         sp = i.split(WORD_SEPARATOR)
         if len(sp) < 3:
@@ -111,7 +117,7 @@ class CacheData:
         self.md5 = hashlib.md5(local_value.encode("UTF-8")).hexdigest() if local_value else None
         self.is_init = True
         if not self.md5:
-            logger.info("[init-cache] cache for %s does not have local value" % key)
+            logger.info("[init-cache] cache for %s does not have local value", key)
 
 
 class SubscribedLocalInstance(object):
@@ -157,15 +163,13 @@ class SubscribedLocalManager(object):
         return key_node.get("LISTENER_MANAGER")
 
     def add_local_listener(self, key, listener_fn):
-        if not self.manager.get(key):
-            self.manager[key] = {}
-        local_listener_manager = self.manager.get(key).get("LISTENER_MANAGER")
+        key_node = self.manager.get(key)
+        if not key_node:
+            key_node = self.manager[key] = {}
+        local_listener_manager = key_node.get("LISTENER_MANAGER")
 
         if not local_listener_manager or not isinstance(local_listener_manager, SimpleListenerManager):
-            self.manager.get(key)["LISTENER_MANAGER"] = SimpleListenerManager()
-        local_listener_manager = self.manager.get(key).get("LISTENER_MANAGER")
-        if not local_listener_manager:
-            return self
+            local_listener_manager = key_node["LISTENER_MANAGER"] = SimpleListenerManager()
         if isinstance(listener_fn, list):
             listener_fn = tuple(listener_fn)
             local_listener_manager.add_listeners(*listener_fn)
@@ -184,16 +188,19 @@ class SubscribedLocalManager(object):
         return self
 
     def get_local_instances(self, key):
-        if not self.manager.get(key):
+        key_node = self.manager.get(key)
+        if not key_node:
             return None
-        return self.manager.get(key).get("LOCAL_INSTANCES")
+        return key_node.get("LOCAL_INSTANCES")
 
     def add_local_instance(self, slc):
-        if not self.manager.get(slc.key):
-            self.manager[slc.key] = {}
-        if not self.manager.get(slc.key).get('LOCAL_INSTANCES'):
-            self.manager.get(slc.key)['LOCAL_INSTANCES'] = {}
-        self.manager.get(slc.key)['LOCAL_INSTANCES'][slc.instance_id] = slc
+        key_node = self.manager.get(slc.key)
+        if not key_node:
+            key_node = self.manager[slc.key] = {}
+        local_instances_node = key_node.get('LOCAL_INSTANCES')
+        if not local_instances_node:
+            local_instances_node = key_node['LOCAL_INSTANCES'] = {}
+        local_instances_node[slc.instance_id] = slc
         return self
 
     def remove_local_instance(self, slc):
@@ -240,7 +247,7 @@ class NacosClient:
                         server_list_temp.append((sp[0], int(port)))
                     except ValueError:
                         logger.warning(
-                            "[get-server-list] bad server address:%s ignored" % server_info)
+                            "[get-server-list] bad server address:%s ignored", server_info)
             if (self.server_list != server_list_temp):
                 self.server_list = server_list_temp
         return server_list_temp
@@ -251,7 +258,7 @@ class NacosClient:
                 time.sleep(10)
                 self.get_server_from_url(url)
             except Exception as ex:
-                logger.exception("get_server_from_url_task %s" % ex)
+                logger.exception("get_server_from_url_task %s", ex)
 
     def initLog(self, logDir, log_level, log_rotation_backup_count):
         if logDir is None or logDir.strip() == "":
@@ -283,14 +290,14 @@ class NacosClient:
             if server_addresses is not None and server_addresses.strip() != "":
                 for server_addr in server_addresses.strip().split(","):
                     self.server_list.append(parse_nacos_server_addr(server_addr.strip()))
-                logger.info("user server address  " + server_addresses)
+                logger.info("user server address  %s", server_addresses)
             elif endpoint is not None and endpoint.strip() != "":
                 url = endpoint.strip()
                 if ("?" not in endpoint):
                     url = url + "?namespace=" + namespace
                 else:
                     url = url + "&namespace=" + namespace
-                logger.info("address server url " + url)
+                logger.info("address server url %s", url)
                 self.get_server_from_url(url)
                 partial_task_function = functools.partial(self.get_server_from_url_task,
                                                           url)
@@ -300,9 +307,9 @@ class NacosClient:
             else:
                 logger.exception("[init] server address & endpoint must not both none")
                 raise ValueError('server address & endpoint must not both none')
-        except Exception as ex:
-            logger.exception("[init] bad server address for %s" % server_addresses)
-            raise ex
+        except Exception:
+            logger.exception("[init] bad server address for %s", server_addresses)
+            raise
 
         self.current_server = self.server_list[0]
 
@@ -323,14 +330,20 @@ class NacosClient:
         self.watcher_mapping = dict()
         self.subscribed_local_manager = SubscribedLocalManager()
         self.subscribe_timer_manager = NacosTimerManager()
+        # timer name --> (listener_interval, args, kwargs) the subscribe timer polls with
+        self.subscribe_args = dict()
+        self.subscribe_lock = RLock()
         self.pulling_lock = RLock()
         self.puller_mapping = None
         self.notify_queue = None
         self.callback_tread_pool = None
-        self.process_mgr = None
 
         self.default_timeout = DEFAULTS["TIMEOUT"]
         self.auth_enabled = self.ak and self.sk
+        # encoded secret key (and hmac prototype) cached for the sk they were built from
+        self._sign_sk = None
+        self._sign_key = None
+        self._sign_hmac = None
         self.cai_enabled = True
         self.pulling_timeout = DEFAULTS["PULLING_TIMEOUT"]
         self.pulling_config_size = DEFAULTS["PULLING_CONFIG_SIZE"]
@@ -340,18 +353,22 @@ class NacosClient:
         self.no_snapshot = False
         self.proxies = None
         self.logDir = logDir
+        # ssl context and proxy opener are shared by all requests of this client
+        self._ssl_context = None
+        self._opener = None
+        self._opener_proxies = None
 
         self.heartbeats: Dict[str, HeartbeatTask] = {}
         self.get_access_token()
-        logger.info("[client-init] endpoint:%s, tenant:%s" % (endpoint, namespace))
+        logger.info("[client-init] endpoint:%s, tenant:%s", endpoint, namespace)
 
     def set_options(self, **kwargs):
         for k, v in kwargs.items():
             if k not in OPTIONS:
-                logger.warning("[set_options] unknown option:%s, ignored" % k)
+                logger.warning("[set_options] unknown option:%s, ignored", k)
                 continue
 
-            logger.debug("[set_options] key:%s, value:%s" % (k, v))
+            logger.debug("[set_options] key:%s, value:%s", k, v)
             setattr(self, k, v)
 
     def change_server(self):
@@ -360,13 +377,13 @@ class NacosClient:
             self.current_server = self.server_list[self.server_offset]
 
     def get_server(self):
-        logger.debug("[get-server] use server:%s" % str(self.current_server))
+        logger.debug("[get-server] use server:%s", self.current_server)
         return self.current_server
 
     def remove_config(self, data_id, group, timeout=None):
         data_id, group = process_common_config_params(data_id, group)
         logger.info(
-            "[remove] data_id:%s, group:%s, namespace:%s, timeout:%s" % (data_id, group, self.namespace, timeout))
+            "[remove] data_id:%s, group:%s, namespace:%s, timeout:%s", data_id, group, self.namespace, timeout)
 
         params = {
             "dataId": data_id,
@@ -379,20 +396,19 @@ class NacosClient:
             resp = self._do_sync_req("/nacos/v1/cs/configs", None, params, None,
                                      timeout or self.default_timeout, "DELETE")
             c = resp.read()
-            logger.info("[remove] remove group:%s, data_id:%s, server response:%s" % (
-                group, data_id, c))
+            logger.info("[remove] remove group:%s, data_id:%s, server response:%s", group, data_id, c)
             return c == b"true"
         except HTTPError as e:
             if e.code == HTTPStatus.FORBIDDEN:
                 logger.error(
-                    "[remove] no right for namespace:%s, group:%s, data_id:%s" % (self.namespace, group, data_id))
+                    "[remove] no right for namespace:%s, group:%s, data_id:%s", self.namespace, group, data_id)
                 raise NacosException("Insufficient privilege.")
             else:
-                logger.error("[remove] error code [:%s] for namespace:%s, group:%s, data_id:%s" % (
-                    e.code, self.namespace, group, data_id))
+                logger.error("[remove] error code [:%s] for namespace:%s, group:%s, data_id:%s",
+                             e.code, self.namespace, group, data_id)
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[remove] exception %s occur" % str(e))
+            logger.exception("[remove] exception %s occur", e)
             raise
 
     def publish_config(self, data_id, group, content, app_name=None, config_type=None, timeout=None):
@@ -400,11 +416,11 @@ class NacosClient:
             raise NacosException("Can not publish none content, use remove instead.")
 
         data_id, group = process_common_config_params(data_id, group)
-        if type(content) == bytes:
+        if isinstance(content, bytes):
             content = content.decode("UTF-8")
 
-        logger.info("[publish] data_id:%s, group:%s, namespace:%s, content:%s, timeout:%s" % (
-            data_id, group, self.namespace, truncate(content), timeout))
+        logger.info("[publish] data_id:%s, group:%s, namespace:%s, content:%s, timeout:%s",
+                    data_id, group, self.namespace, LazyTruncate(content), timeout)
 
         params = {
             "dataId": data_id,
@@ -425,26 +441,24 @@ class NacosClient:
             resp = self._do_sync_req("/nacos/v1/cs/configs", None, params, None,
                                      timeout or self.default_timeout, "POST")
             c = resp.read()
-            logger.info("[publish] publish content, group:%s, data_id:%s, server response:%s" % (
-                group, data_id, c))
+            logger.info("[publish] publish content, group:%s, data_id:%s, server response:%s", group, data_id, c)
             return c == b"true"
         except HTTPError as e:
             if e.code == HTTPStatus.FORBIDDEN:
                 logger.info(
-                    "[publish] publish content fail result code :403, group:%s, data_id:%s" % (
-                        group, data_id))
+                    "[publish] publish content fail result code :403, group:%s, data_id:%s", group, data_id)
                 raise NacosException("Insufficient privilege.")
             else:
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[publish] exception %s occur" % str(e))
+            logger.exception("[publish] exception %s occur", e)
             raise
 
     def get_config(self, data_id, group, timeout=None, no_snapshot=None):
         no_snapshot = self.no_snapshot if no_snapshot is None else no_snapshot
         data_id, group = process_common_config_params(data_id, group)
-        logger.debug("[get-config] data_id:%s, group:%s, namespace:%s, timeout:%s" % (
-            data_id, group, self.namespace, timeout))
+        logger.debug("[get-config] data_id:%s, group:%s, namespace:%s, timeout:%s",
+                     data_id, group, self.namespace, timeout)
 
         params = {
             "dataId": data_id,
@@ -457,9 +471,9 @@ class NacosClient:
         # get from failover
         content = read_file_str(self.failover_base, cache_key)
         if content is None:
-            logger.debug("[get-config] failover config is not exist for %s, try to get from server" % cache_key)
+            logger.debug("[get-config] failover config is not exist for %s, try to get from server", cache_key)
         else:
-            logger.debug("[get-config] get %s from failover directory, content is %s" % (cache_key, truncate(content)))
+            logger.debug("[get-config] get %s from failover directory, content is %s", cache_key, LazyTruncate(content))
             return content
 
         # get from server
@@ -469,25 +483,25 @@ class NacosClient:
         except HTTPError as e:
             if e.code == HTTPStatus.NOT_FOUND:
                 logger.warning(
-                    "[get-config] config not found for data_id:%s, group:%s, namespace:%s, try to delete snapshot" % (
-                        data_id, group, self.namespace))
+                    "[get-config] config not found for data_id:%s, group:%s, namespace:%s, try to delete snapshot",
+                    data_id, group, self.namespace)
                 delete_file(self.snapshot_base, cache_key)
                 return None
             elif e.code == HTTPStatus.CONFLICT:
                 logger.error(
-                    "[get-config] config being modified concurrently for data_id:%s, group:%s, namespace:%s" % (
-                        data_id, group, self.namespace))
+                    "[get-config] config being modified concurrently for data_id:%s, group:%s, namespace:%s",
+                    data_id, group, self.namespace)
             elif e.code == HTTPStatus.FORBIDDEN:
-                logger.error("[get-config] no right for data_id:%s, group:%s, namespace:%s" % (
-                    data_id, group, self.namespace))
+                logger.error("[get-config] no right for data_id:%s, group:%s, namespace:%s",
+                             data_id, group, self.namespace)
                 raise NacosException("Insufficient privilege.")
             else:
-                logger.error("[get-config] error code [:%s] for data_id:%s, group:%s, namespace:%s" % (
-                    e.code, data_id, group, self.namespace))
+                logger.error("[get-config] error code [:%s] for data_id:%s, group:%s, namespace:%s",
+                             e.code, data_id, group, self.namespace)
                 if no_snapshot:
                     raise
         except Exception as e:
-            logger.exception("[get-config] exception %s occur" % str(e))
+            logger.exception("[get-config] exception %s occur", e)
             if no_snapshot:
                 raise
 
@@ -496,28 +510,28 @@ class NacosClient:
 
         if content is not None:
             logger.debug(
-                "[get-config] content from server:%s, data_id:%s, group:%s, namespace:%s, try to save snapshot" % (
-                    truncate(content), data_id, group, self.namespace))
+                "[get-config] content from server:%s, data_id:%s, group:%s, namespace:%s, try to save snapshot",
+                LazyTruncate(content), data_id, group, self.namespace)
             try:
                 save_file(self.snapshot_base, cache_key, content)
             except Exception as e:
-                logger.exception("[get-config] save snapshot failed for %s, data_id:%s, group:%s, namespace:%s" % (
-                    data_id, group, self.namespace, str(e)))
+                logger.exception("[get-config] save snapshot failed for %s, data_id:%s, group:%s, namespace:%s",
+                                 data_id, group, self.namespace, e)
             return content
 
-        logger.info("[get-config] get config from server failed, try snapshot, data_id:%s, group:%s, namespace:%s" % (
-            data_id, group, self.namespace))
+        logger.info("[get-config] get config from server failed, try snapshot, data_id:%s, group:%s, namespace:%s",
+                    data_id, group, self.namespace)
         content = read_file_str(self.snapshot_base, cache_key)
         if content is None:
-            logger.info("[get-config] snapshot is not exist for %s." % cache_key)
+            logger.info("[get-config] snapshot is not exist for %s.", cache_key)
         else:
-            logger.info("[get-config] get %s from snapshot directory, content is %s" % (cache_key, truncate(content)))
+            logger.info("[get-config] get %s from snapshot directory, content is %s", cache_key, LazyTruncate(content))
             return content
 
     def get_configs(self, timeout=None, no_snapshot=None, group="", page_no=1, page_size=1000):
         no_snapshot = self.no_snapshot if no_snapshot is None else no_snapshot
-        logger.info("[get-configs] namespace:%s, timeout:%s, group:%s, page_no:%s, page_size:%s" % (
-            self.namespace, timeout, group, page_no, page_size))
+        logger.info("[get-configs] namespace:%s, timeout:%s, group:%s, page_no:%s, page_size:%s",
+                    self.namespace, timeout, group, page_no, page_size)
 
         params = {
             "dataId": "",
@@ -533,9 +547,9 @@ class NacosClient:
         # get from failover
         content = read_file_str(self.failover_base, cache_key)
         if content is None:
-            logger.debug("[get-config] failover config is not exist for %s, try to get from server" % cache_key)
+            logger.debug("[get-config] failover config is not exist for %s, try to get from server", cache_key)
         else:
-            logger.debug("[get-config] get %s from failover directory, content is %s" % (cache_key, truncate(content)))
+            logger.debug("[get-config] get %s from failover directory, content is %s", cache_key, LazyTruncate(content))
             return json.loads(content)
 
         # get from server
@@ -545,16 +559,16 @@ class NacosClient:
         except HTTPError as e:
             if e.code == HTTPStatus.CONFLICT:
                 logger.error(
-                    "[get-configs] configs being modified concurrently for namespace:%s" % self.namespace)
+                    "[get-configs] configs being modified concurrently for namespace:%s", self.namespace)
             elif e.code == HTTPStatus.FORBIDDEN:
-                logger.error("[get-configs] no right for namespace:%s" % self.namespace)
+                logger.error("[get-configs] no right for namespace:%s", self.namespace)
                 raise NacosException("Insufficient privilege.")
             else:
-                logger.error("[get-configs] error code [:%s] for namespace:%s" % (e.code, self.namespace))
+                logger.error("[get-configs] error code [:%s] for namespace:%s", e.code, self.namespace)
                 if no_snapshot:
                     raise
         except Exception as e:
-            logger.exception("[get-config] exception %s occur" % str(e))
+            logger.exception("[get-config] exception %s occur", e)
             if no_snapshot:
                 raise
 
@@ -563,8 +577,8 @@ class NacosClient:
 
         if content is not None:
             logger.info(
-                "[get-configs] content from server:%s, namespace:%s, try to save snapshot" % (
-                    truncate(content), self.namespace))
+                "[get-configs] content from server:%s, namespace:%s, try to save snapshot",
+                LazyTruncate(content), self.namespace)
             try:
                 save_file(self.snapshot_base, cache_key, content)
 
@@ -575,16 +589,16 @@ class NacosClient:
                     item_cache_key = group_key(data_id, group, self.namespace)
                     save_file(self.snapshot_base, item_cache_key, item_content)
             except Exception as e:
-                logger.exception("[get-configs] save snapshot failed for %s, namespace:%s" % (
-                    str(e), self.namespace))
+                logger.exception("[get-configs] save snapshot failed for %s, namespace:%s", e, self.namespace)
             return json.loads(content)
 
-        logger.error("[get-configs] get config from server failed, try snapshot, namespace:%s" % self.namespace)
+        logger.error("[get-configs] get config from server failed, try snapshot, namespace:%s", self.namespace)
         content = read_file_str(self.snapshot_base, cache_key)
         if content is None:
-            logger.warning("[get-configs] snapshot is not exist for %s." % cache_key)
+            logger.warning("[get-configs] snapshot is not exist for %s.", cache_key)
         else:
-            logger.debug("[get-configs] get %s from snapshot directory, content is %s" % (cache_key, truncate(content)))
+            logger.debug("[get-configs] get %s from snapshot directory, content is %s",
+                         cache_key, LazyTruncate(content))
             return json.loads(content)
 
     @synchronized_with_attr("pulling_lock")
@@ -596,7 +610,7 @@ class NacosClient:
         if not cb_list:
             raise NacosException("A callback function is needed.")
         data_id, group = process_common_config_params(data_id, group)
-        logger.info("[add-watcher] data_id:%s, group:%s, namespace:%s" % (data_id, group, self.namespace))
+        logger.info("[add-watcher] data_id:%s, group:%s, namespace:%s", data_id, group, self.namespace)
         cache_key = group_key(data_id, group, self.namespace)
         wl = self.watcher_mapping.get(cache_key)
         if not wl:
@@ -607,26 +621,27 @@ class NacosClient:
         last_md5 = NacosClient.get_md5(content)
         for cb in cb_list:
             wl.append(WatcherWrap(cache_key, cb, last_md5))
-            logger.info("[add-watcher] watcher has been added for key:%s, new callback is:%s, callback number is:%s" % (
-                cache_key, cb.__name__, len(wl)))
+            logger.info("[add-watcher] watcher has been added for key:%s, new callback is:%s, callback number is:%s",
+                        cache_key, cb.__name__, len(wl))
 
         if self.puller_mapping is None:
             logger.debug("[add-watcher] pulling should be initialized")
             self._init_pulling()
 
         if cache_key in self.puller_mapping:
-            logger.debug("[add-watcher] key:%s is already in pulling" % cache_key)
+            logger.debug("[add-watcher] key:%s is already in pulling", cache_key)
             return
 
         for key, puller_info in self.puller_mapping.items():
             if len(puller_info[1]) < self.pulling_config_size:
-                logger.debug("[add-watcher] puller:%s is available, add key:%s" % (puller_info[0], cache_key))
+                logger.debug("[add-watcher] puller:%s is available, add key:%s", puller_info[0], cache_key)
                 puller_info[1].append(cache_key)
                 self.puller_mapping[cache_key] = puller_info
                 break
         else:
-            logger.debug("[add-watcher] no puller available, new one and add key:%s" % cache_key)
-            key_list = self.process_mgr.list()
+            logger.debug("[add-watcher] no puller available, new one and add key:%s", cache_key)
+            # pullers are threads, so a plain list is shared without a manager process round trip
+            key_list = list()
             key_list.append(cache_key)
             sys_os = platform.system()
 
@@ -647,7 +662,7 @@ class NacosClient:
         cache_key = group_key(data_id, group, self.namespace)
         wl = self.watcher_mapping.get(cache_key)
         if not wl:
-            logger.warning("[remove-watcher] there is no watcher on key:%s" % cache_key)
+            logger.warning("[remove-watcher] there is no watcher on key:%s", cache_key)
             return
 
         wrap_to_remove = list()
@@ -660,14 +675,14 @@ class NacosClient:
         for i in wrap_to_remove:
             wl.remove(i)
 
-        logger.info("[remove-watcher] %s is removed from %s, remove all:%s" % (cb.__name__, cache_key, remove_all))
+        logger.info("[remove-watcher] %s is removed from %s, remove all:%s", cb.__name__, cache_key, remove_all)
         if not wl:
-            logger.debug("[remove-watcher] there is no watcher for:%s, kick out from pulling" % cache_key)
+            logger.debug("[remove-watcher] there is no watcher for:%s, kick out from pulling", cache_key)
             self.watcher_mapping.pop(cache_key)
             puller_info = self.puller_mapping[cache_key]
             puller_info[1].remove(cache_key)
             if not puller_info[1]:
-                logger.debug("[remove-watcher] there is no pulling keys for puller:%s, stop it" % puller_info[0])
+                logger.debug("[remove-watcher] there is no pulling keys for puller:%s, stop it", puller_info[0])
                 self.puller_mapping.pop(cache_key)
                 if isinstance(puller_info[0], Process):
                     puller_info[0].terminate()
@@ -683,8 +698,8 @@ class NacosClient:
         self._inject_auth_info(all_headers, all_params, data, module)
         url = "?".join([url, urlencode(all_params)]) if all_params else url
         logger.debug(
-            "[do-sync-req] url:%s, headers:%s, params:%s, data:%s, timeout:%s" % (
-                url, all_headers, all_params, data, timeout))
+            "[do-sync-req] url:%s, headers:%s, params:%s, data:%s, timeout:%s",
+            url, all_headers, all_params, data, timeout)
         tries = 0
         while True:
             try:
@@ -697,48 +712,60 @@ class NacosClient:
                 server_url = server
                 if not server_url.startswith("http"):
                     server_url = "%s://%s" % ("http", server)
-                if python_version_bellow("3"):
+                if PYTHON_BELOW_3:
                     req = Request(url=server_url + url, data=urlencode(data).encode() if data else None,
                                   headers=all_headers)
                     req.get_method = lambda: method
-                    ctx = ssl.create_default_context()
-                    ctx.check_hostname = False
-                    ctx.verify_mode = ssl.CERT_NONE
                 else:
                     req = Request(url=server_url + url, data=urlencode(data).encode() if data else None,
                                   headers=all_headers, method=method)
-                    ctx = ssl.SSLContext()
-                # build a new opener that adds proxy setting so that http request go through the proxy
                 if self.proxies:
-                    proxy_support = ProxyHandler(self.proxies)
-                    https_support = HTTPSHandler(context=ctx)
-                    opener = build_opener(proxy_support, https_support)
-                    resp = opener.open(req, timeout=timeout)
+                    resp = self._get_proxy_opener().open(req, timeout=timeout)
                 else:
                     # for python version compatibility
-                    if python_version_bellow("2.7.5"):
+                    if PYTHON_BELOW_2_7_5:
                         resp = urlopen(req, timeout=timeout)
                     else:
-                        resp = urlopen(req, timeout=timeout, context=ctx)
-                logger.debug("[do-sync-req] info from server:%s" % server)
+                        resp = urlopen(req, timeout=timeout, context=self._get_ssl_context())
+                logger.debug("[do-sync-req] info from server:%s", server)
                 return resp
             except HTTPError as e:
-                if e.code in [HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.BAD_GATEWAY,
-                              HTTPStatus.SERVICE_UNAVAILABLE]:
-                    logger.warning("[do-sync-req] server:%s is not available for reason:%s" % (server, e.msg))
+                if e.code in RETRYABLE_HTTP_STATUS:
+                    logger.warning("[do-sync-req] server:%s is not available for reason:%s", server, e.msg)
                 else:
                     raise
             except socket.timeout:
-                logger.warning("[do-sync-req] %s request timeout" % server)
+                logger.warning("[do-sync-req] %s request timeout", server)
             except URLError as e:
-                logger.warning("[do-sync-req] %s connection error:%s" % (server, e.reason))
+                logger.warning("[do-sync-req] %s connection error:%s", server, e.reason)
 
             tries += 1
             if tries >= len(self.server_list):
-                logger.error("[do-sync-req] %s maybe down, no server is currently available" % server)
+                logger.error("[do-sync-req] %s maybe down, no server is currently available", server)
                 raise NacosRequestException("All server are not available")
             self.change_server()
-            logger.warning("[do-sync-req] %s maybe down, skip to next" % server)
+            logger.warning("[do-sync-req] %s maybe down, skip to next", server)
+
+    def _get_ssl_context(self):
+        if self._ssl_context is None:
+            if PYTHON_BELOW_3:
+                ctx = ssl.create_default_context()
+                ctx.check_hostname = False
+                ctx.verify_mode = ssl.CERT_NONE
+            else:
+                ctx = ssl.SSLContext()
+            self._ssl_context = ctx
+        return self._ssl_context
+
+    def _get_proxy_opener(self):
+        # build an opener that adds proxy setting so that http request go through the proxy,
+        # and rebuild it only when proxies are changed, including in-place changes of the dict
+        if self._opener is None or self._opener_proxies != self.proxies:
+            proxy_support = ProxyHandler(self.proxies)
+            https_support = HTTPSHandler(context=self._get_ssl_context())
+            self._opener = build_opener(proxy_support, https_support)
+            self._opener_proxies = dict(self.proxies)
+        return self._opener
 
     def _do_pulling(self, cache_list, queue):
         cache_pool = dict()
@@ -752,7 +779,7 @@ class NacosClient:
             for cache_key in cache_list:
                 cache_data = cache_pool.get(cache_key)
                 if not cache_data:
-                    logger.debug("[do-pulling] new key added: %s" % cache_key)
+                    logger.debug("[do-pulling] new key added: %s", cache_key)
                     cache_data = CacheData(cache_key, self)
                     cache_pool[cache_key] = cache_data
                 else:
@@ -764,11 +791,11 @@ class NacosClient:
                     [data_id, group, cache_data.md5 or "", self.namespace]) + LINE_SEPARATOR
 
             for k in unused_keys:
-                logger.debug("[do-pulling] %s is no longer watched, remove from cache" % k)
+                logger.debug("[do-pulling] %s is no longer watched, remove from cache", k)
                 cache_pool.pop(k)
 
             logger.debug(
-                "[do-pulling] try to detected change from server probe string is %s" % truncate(probe_update_string))
+                "[do-pulling] try to detected change from server probe string is %s", LazyTruncate(probe_update_string))
             headers = {"Long-Pulling-Timeout": int(self.pulling_timeout * 1000)}
             # if contains_init_key:
             #     headers["longPullingNoHangUp"] = "true"
@@ -780,12 +807,12 @@ class NacosClient:
                 resp = self._do_sync_req("/nacos/v1/cs/configs/listener", headers, None, data,
                                          self.pulling_timeout + 10, "POST")
                 changed_keys = [group_key(*i) for i in parse_pulling_result(resp.read())]
-                logger.info("[do-pulling] following keys are changed from server %s" % truncate(str(changed_keys)))
+                logger.info("[do-pulling] following keys are changed from server %s", LazyTruncate(changed_keys))
             except NacosException as e:
-                logger.error("[do-pulling] nacos exception: %s, waiting for recovery" % str(e))
+                logger.error("[do-pulling] nacos exception: %s, waiting for recovery", e)
                 time.sleep(1)
             except Exception as e:
-                logger.exception("[do-pulling] exception %s occur, return empty list, waiting for recovery" % str(e))
+                logger.exception("[do-pulling] exception %s occur, return empty list, waiting for recovery", e)
                 time.sleep(1)
 
             for cache_key, cache_data in cache_pool.items():
@@ -805,7 +832,6 @@ class NacosClient:
         self.puller_mapping = dict()
         self.notify_queue = Queue()
         self.callback_tread_pool = pool.ThreadPool(self.callback_thread_num)
-        self.process_mgr = Manager()
         t = Thread(target=self._process_polling_result)
         t.setDaemon(True)
         t.start()
@@ -814,10 +840,10 @@ class NacosClient:
     def _process_polling_result(self):
         while True:
             cache_key, content, md5 = self.notify_queue.get()
-            logger.info("[process-polling-result] receive an event:%s" % cache_key)
+            logger.info("[process-polling-result] receive an event:%s", cache_key)
             wl = self.watcher_mapping.get(cache_key)
             if not wl:
-                logger.warning("[process-polling-result] no watcher on %s, ignored" % cache_key)
+                logger.warning("[process-polling-result] no watcher on %s, ignored", cache_key)
                 continue
 
             data_id, group, namespace = parse_key(cache_key)
@@ -833,18 +859,18 @@ class NacosClient:
             for watcher in wl:
                 if not watcher.last_md5 == md5:
                     logger.info(
-                        "[process-polling-result] md5 changed since last call, calling %s with changed md5: %s ,params: %s"
-                        % (watcher.callback.__name__, md5, params))
+                        "[process-polling-result] md5 changed since last call, calling %s with changed md5: %s ,params: %s",
+                        watcher.callback.__name__, md5, params)
                     try:
                         self.callback_tread_pool.apply(watcher.callback, (params,))
                     except Exception as e:
-                        logger.exception("[process-polling-result] exception %s occur while calling %s " % (
-                            str(e), watcher.callback.__name__))
+                        logger.exception("[process-polling-result] exception %s occur while calling %s ",
+                                         e, watcher.callback.__name__)
                     watcher.last_md5 = md5
 
     @staticmethod
     def _inject_version_info(headers):
-        headers.update({"User-Agent": "Nacos-Python-Client:v" + VERSION})
+        headers["User-Agent"] = USER_AGENT
 
     def get_access_token(self, force_refresh=False):
         current_time = time.time()
@@ -862,10 +888,10 @@ class NacosClient:
             self.token = response_data.get('accessToken')
             self.token_ttl = response_data.get('tokenTtl', 18000)  # 默认使用返回值，无返回则使用18000秒
             self.token_expire_time = current_time + self.token_ttl - 10  # 更新 Token 的过期时间
-            logger.info(
-                f"[get_access_token] AccessToken: {self.token}, TTL: {self.token_ttl}，force_refresh：{force_refresh}")
+            logger.info("[get_access_token] AccessToken: %s, TTL: %s，force_refresh：%s",
+                        self.token, self.token_ttl, force_refresh)
         except Exception as e:
-            logger.exception("[get-access-token] exception %s occur" % str(e))
+            logger.exception("[get-access-token] exception %s occur", e)
             raise
 
     def _inject_auth_info(self, headers, params, data, module="config"):
@@ -885,8 +911,6 @@ class NacosClient:
         ts = str(int(time.time() * 1000))
         ak, sk = self.ak, self.sk
 
-        sign_str = ""
-
         params_to_sign = params or data or {}
         # config signature
         if "config" == module:
@@ -898,12 +922,8 @@ class NacosClient:
             tenant = params_to_sign.get("tenant")
             group = params_to_sign.get("group")
 
-            if tenant:
-                sign_str = tenant + "+"
-            if group:
-                sign_str = sign_str + group + "+"
-            if sign_str:
-                sign_str += ts
+            if tenant or group:
+                sign_str = (tenant + "+" if tenant else "") + (group + "+" if group else "") + ts
                 headers["Spas-Signature"] = self.__do_sign(sign_str, sk)
 
         # naming signature
@@ -912,36 +932,47 @@ class NacosClient:
             service_name = params_to_sign.get("serviceName")
 
             if service_name:
-                if "@@" in service_name or group is None or group == "":
-                    sign_str = service_name
+                if "@@" in service_name or not group:
+                    sign_str = "@@".join((ts, service_name))
                 else:
-                    sign_str = group + "@@" + service_name
-                sign_str = ts + "@@" + sign_str
+                    sign_str = "@@".join((ts, group, service_name))
             else:
                 sign_str = ts
 
-            params.update({
-                "ak": ak,
-                "data": sign_str,
-                "signature": self.__do_sign(sign_str, sk),
-            })
+            params["ak"] = ak
+            params["data"] = sign_str
+            params["signature"] = self.__do_sign(sign_str, sk)
+
+    def __get_sign_key(self, sk):
+        if sk is not self._sign_sk:
+            self._sign_key = sk.encode()
+            if not HMAC_DIGEST_SUPPORTED:
+                self._sign_hmac = hmac.new(self._sign_key, digestmod=hashlib.sha1)
+            self._sign_sk = sk
+        return self._sign_key
 
     def __do_sign(self, sign_str, sk):
-        return base64.encodebytes(
-            hmac.new(sk.encode(), sign_str.encode(), digestmod=hashlib.sha1).digest()).decode().strip()
+        key = self.__get_sign_key(sk)
+        if HMAC_DIGEST_SUPPORTED:
+            digest = hmac.digest(key, sign_str.encode(), "sha1")
+        else:
+            h = self._sign_hmac.copy()
+            h.update(sign_str.encode())
+            digest = h.digest()
+        return base64.b64encode(digest).decode("ascii")
 
     def _build_metadata(self, metadata, params):
         if metadata:
             if isinstance(metadata, dict):
-                params["metadata"] = json.dumps(metadata)
+                params["metadata"] = json.dumps(metadata, separators=(",", ":"))
             else:
                 params["metadata"] = metadata
 
     def add_naming_instance(self, service_name, ip, port, cluster_name=None, weight=1.0, metadata=None,
                             enable=True, healthy=True, ephemeral=True, group_name=DEFAULT_GROUP_NAME,
                             heartbeat_interval=None):
-        logger.info("[add-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s" % (
-            ip, port, service_name, self.namespace))
+        logger.info("[add-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s",
+                    ip, port, service_name, self.namespace)
 
         params = {
             "ip": ip,
@@ -963,8 +994,8 @@ class NacosClient:
             resp = self._do_sync_req("/nacos/v1/ns/instance", None, params, None, self.default_timeout, "POST",
                                      "naming")
             c = resp.read()
-            logger.info("[add-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s" % (
-                ip, port, service_name, self.namespace, c))
+            logger.info("[add-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s",
+                        ip, port, service_name, self.namespace, c)
             result = c == b"ok"
 
             if result and ephemeral and heartbeat_interval is not None:
@@ -978,7 +1009,7 @@ class NacosClient:
             else:
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[add-naming-instance] exception %s occur" % str(e))
+            logger.exception("[add-naming-instance] exception %s occur", e)
             raise
 
     def __add_naming_heartbeat(self, service_name, beat_info: HeartbeatInfo):
@@ -993,8 +1024,8 @@ class NacosClient:
 
     def remove_naming_instance(self, service_name, ip, port, cluster_name=None, ephemeral=True,
                                group_name=DEFAULT_GROUP_NAME):
-        logger.info("[remove-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s" % (
-            ip, port, service_name, self.namespace))
+        logger.info("[remove-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s",
+                    ip, port, service_name, self.namespace)
 
         params = {
             "ip": ip,
@@ -1014,11 +1045,12 @@ class NacosClient:
             resp = self._do_sync_req("/nacos/v1/ns/instance", None, params, None, self.default_timeout, "DELETE",
                                      "naming")
             c = resp.read()
-            logger.info("[remove-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s" % (
-                ip, port, service_name, self.namespace, c))
-            if ephemeral:
+            logger.info("[remove-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s",
+                        ip, port, service_name, self.namespace, c)
+            # only clients registered with heartbeat_interval have beat tasks to stop
+            if ephemeral and self.heartbeats:
                 beat_info_key = "%s#%s#%s" % (service_name, ip, port)
-                exist_task = self.heartbeats.get(beat_info_key)
+                exist_task = self.heartbeats.pop(beat_info_key, None)
                 if exist_task:
                     exist_task.stop()
             return c == b"ok"
@@ -1028,13 +1060,13 @@ class NacosClient:
             else:
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[remove-naming-instance] exception %s occur" % str(e))
+            logger.exception("[remove-naming-instance] exception %s occur", e)
             raise
 
     def modify_naming_instance(self, service_name, ip, port, cluster_name=None, weight=None, metadata=None,
                                enable=None, ephemeral=True, group_name=DEFAULT_GROUP_NAME):
-        logger.info("[modify-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s" % (
-            ip, port, service_name, self.namespace))
+        logger.info("[modify-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s",
+                    ip, port, service_name, self.namespace)
 
         params = {
             "ip": ip,
@@ -1061,8 +1093,8 @@ class NacosClient:
         try:
             resp = self._do_sync_req("/nacos/v1/ns/instance", None, params, None, self.default_timeout, "PUT", "naming")
             c = resp.read()
-            logger.info("[modify-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s" % (
-                ip, port, service_name, self.namespace, c))
+            logger.info("[modify-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s",
+                        ip, port, service_name, self.namespace, c)
             return c == b"ok"
         except HTTPError as e:
             if e.code == HTTPStatus.FORBIDDEN:
@@ -1070,7 +1102,7 @@ class NacosClient:
             else:
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[modify-naming-instance] exception %s occur" % str(e))
+            logger.exception("[modify-naming-instance] exception %s occur", e)
             raise
 
     def list_naming_instance(self, service_name, clusters=None, namespace_id=None, group_name=None, healthy_only=False):
@@ -1081,7 +1113,7 @@ class NacosClient:
         :param group_name:          分组名
         :param healthy_only:         是否只返回健康实例   否，默认为false
         """
-        logger.info("[list-naming-instance] service_name:%s, namespace:%s" % (service_name, self.namespace))
+        logger.info("[list-naming-instance] service_name:%s, namespace:%s", service_name, self.namespace)
 
         params = {
             "serviceName": service_name,
@@ -1103,8 +1135,8 @@ class NacosClient:
             resp = self._do_sync_req("/nacos/v1/ns/instance/list", None, params, None, self.default_timeout, "GET",
                                      "naming")
             c = resp.read()
-            logger.info("[list-naming-instance] service_name:%s, namespace:%s, server response:%s" %
-                        (service_name, self.namespace, c))
+            logger.info("[list-naming-instance] service_name:%s, namespace:%s, server response:%s",
+                        service_name, self.namespace, c)
             return json.loads(c.decode("UTF-8"))
         except HTTPError as e:
             if e.code == HTTPStatus.FORBIDDEN:
@@ -1112,12 +1144,12 @@ class NacosClient:
             else:
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[list-naming-instance] exception %s occur" % str(e))
+            logger.exception("[list-naming-instance] exception %s occur", e)
             raise
 
     def get_naming_instance(self, service_name, ip, port, cluster_name=None):
-        logger.info("[get-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s" % (ip, port, service_name,
-                                                                                             self.namespace))
+        logger.info("[get-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s",
+                    ip, port, service_name, self.namespace)
 
         params = {
             "serviceName": service_name,
@@ -1135,8 +1167,8 @@ class NacosClient:
         try:
             resp = self._do_sync_req("/nacos/v1/ns/instance", None, params, None, self.default_timeout, "GET", "naming")
             c = resp.read()
-            logger.info("[get-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s" %
-                        (ip, port, service_name, self.namespace, c))
+            logger.info("[get-naming-instance] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s",
+                        ip, port, service_name, self.namespace, c)
             return json.loads(c.decode("UTF-8"))
         except HTTPError as e:
             if e.code == HTTPStatus.FORBIDDEN:
@@ -1144,13 +1176,13 @@ class NacosClient:
             else:
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[get-naming-instance] exception %s occur" % str(e))
+            logger.exception("[get-naming-instance] exception %s occur", e)
             raise
 
     def send_heartbeat(self, service_name, ip, port, cluster_name=None, weight=1.0, metadata=None, ephemeral=True,
                        group_name=DEFAULT_GROUP_NAME):
-        logger.info("[send-heartbeat] ip:%s, port:%s, service_name:%s, namespace:%s" % (ip, port, service_name,
-                                                                                        self.namespace))
+        logger.info("[send-heartbeat] ip:%s, port:%s, service_name:%s, namespace:%s",
+                    ip, port, service_name, self.namespace)
         beat_data = {
             "serviceName": service_name,
             "ip": ip,
@@ -1171,7 +1203,7 @@ class NacosClient:
 
         params = {
             "serviceName": service_name,
-            "beat": json.dumps(beat_data),
+            "beat": json.dumps(beat_data, separators=(",", ":")),
             "groupName": group_name
         }
 
@@ -1182,8 +1214,8 @@ class NacosClient:
             resp = self._do_sync_req("/nacos/v1/ns/instance/beat", None, params, None, self.default_timeout, "PUT",
                                      "naming")
             c = resp.read()
-            logger.info("[send-heartbeat] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s" %
-                        (ip, port, service_name, self.namespace, c))
+            logger.info("[send-heartbeat] ip:%s, port:%s, service_name:%s, namespace:%s, server response:%s",
+                        ip, port, service_name, self.namespace, c)
             return json.loads(c.decode("UTF-8"))
         except HTTPError as e:
             if e.code == HTTPStatus.FORBIDDEN:
@@ -1191,13 +1223,18 @@ class NacosClient:
             else:
                 raise NacosException("Request Error, code is %s" % e.code)
         except Exception as e:
-            logger.exception("[send-heartbeat] exception %s occur" % str(e))
+            logger.exception("[send-heartbeat] exception %s occur", e)
             raise
 
+    @synchronized_with_attr("subscribe_lock")
     def subscribe(self,
                   listener_fn, listener_interval=7, *args, **kwargs):
         """
         reference at `/nacos/v1/ns/instance/list` in https://nacos.io/zh-cn/docs/open-api.html
+        一个服务只有一个订阅定时器，监听按 service_name 共享该定时器的轮询结果：
+        参数相同的重复订阅只追加监听，复用已有的定时器；
+        服务已有存活的订阅且参数（listener_interval 及查询参数）不同时抛出 NacosException，
+        需先 stop_subscribe 再以新参数订阅
         :param listener_fn           监听方法，可以是元组，列表，单个监听方法
         :param listener_interval     监听间隔，在 HTTP 请求 OpenAPI 时间间隔
         :return:
@@ -1208,6 +1245,19 @@ class NacosClient:
                 service_name = args[0]
             else:
                 raise NacosException("`service_name` is required in subscribe")
+
+        timer_name = 'service-subscribe-timer-{key}'.format(key=service_name)
+        subscribe_args = (listener_interval, args, kwargs)
+        exist_timer = self.subscribe_timer_manager.all_timers().get(timer_name)
+        if exist_timer and exist_timer.alive():
+            if self.subscribe_args.get(timer_name) != subscribe_args:
+                raise NacosException("service:%s is already subscribed with different args, "
+                                     "stop_subscribe before subscribing it again" % service_name)
+            #  复用已有定时器的轮询，避免重复请求
+            self.subscribed_local_manager.add_local_listener(key=service_name, listener_fn=listener_fn)
+            return
+        if exist_timer:
+            self.subscribe_timer_manager.stop_timer(timer_name)
         self.subscribed_local_manager.add_local_listener(key=service_name, listener_fn=listener_fn)
 
         #  判断是否是第一次订阅调用
@@ -1259,12 +1309,12 @@ class NacosClient:
                         self.subscribed_local_manager.remove_local_instance(slc)
                         self.subscribed_local_manager.do_listener_launch(service_name, Event.DELETED, slc)
 
-        timer_name = 'service-subscribe-timer-{key}'.format(key=service_name)
         subscribe_timer = NacosTimer(name=timer_name,
                                      interval=listener_interval,
                                      fn=_compare_and_trigger_listener)
-        subscribe_timer.scheduler()
         self.subscribe_timer_manager.add_timer(subscribe_timer)
+        self.subscribe_args[timer_name] = subscribe_args
+        subscribe_timer.scheduler()
 
     def unsubscribe(self, service_name, listener_name=None):
         """
@@ -1286,4 +1336,6 @@ class NacosClient:
         stop subscribe timer scheduler
         :return: 
         """
-        self.subscribe_timer_manager.stop()
\ No newline at end of file
+        with self.subscribe_lock:
+            self.subscribe_timer_manager.stop()
+            self.subscribe_args.clear()
\ No newline at end of file
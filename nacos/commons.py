@@ -1,8 +1,10 @@
+import functools
 import sys
 
 
 def synchronized_with_attr(attr_name):
     def decorator(func):
+        @functools.wraps(func)
         def synced_func(*args, **kws):
             self = args[0]
             lock = getattr(self, attr_name)
@@ -20,6 +22,23 @@ def truncate(ori_str, length=100):
     return ori_str[:length] + "..." if len(ori_str) > length else ori_str
 
 
+class LazyTruncate(object):
+    """
+    truncate `ori` only when it is formatted, so it can be passed as a lazy logging argument
+    """
+    __slots__ = ['_ori', '_length']
+
+    def __init__(self, ori, length=100):
+        self._ori = ori
+        self._length = length
+
+    def __str__(self):
+        ori = self._ori
+        if ori is not None and not isinstance(ori, str):
+            ori = str(ori)
+        return truncate(ori, self._length)
+
+
 def python_version_bellow(version):
     if not version:
         return False
@@ -14,7 +14,7 @@ logger = logging.getLogger("nacos")
 
 def read_file_str(base, key):
     content = read_file(base, key)
-    return content.decode("UTF-8") if type(content) == bytes else content
+    return content.decode("UTF-8") if isinstance(content, bytes) else content
 
 
 def read_file(base, key):
@@ -32,7 +32,7 @@ def read_file(base, key):
                 lock_file(f)
                 return f.read()
     except OSError:
-        logger.exception("[read-file] read file failed, file path:%s" % file_path)
+        logger.exception("[read-file] read file failed, file path:%s", file_path)
         return None
 
 
@@ -42,15 +42,15 @@ def save_file(base, key, content):
         try:
             os.makedirs(base)
         except OSError:
-            logger.warning("[save-file] dir %s is already exist" % base)
+            logger.warning("[save-file] dir %s is already exist", base)
 
     try:
         with open(file_path, "wb") as f:
             lock_file(f)
-            f.write(content if type(content) == bytes else content.encode("UTF-8"))
+            f.write(content if isinstance(content, bytes) else content.encode("UTF-8"))
 
     except OSError:
-        logger.exception("[save-file] save file failed, file path:%s" % file_path)
+        logger.exception("[save-file] save file failed, file path:%s", file_path)
 
 
 def delete_file(base, key):
@@ -58,7 +58,7 @@ def delete_file(base, key):
     try:
         os.remove(file_path)
     except OSError:
-        logger.warning("[delete-file] file not exists, file path:%s" % file_path)
+        logger.warning("[delete-file] file not exists, file path:%s", file_path)
 
 
 def lock_file(f):
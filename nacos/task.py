@@ -1,3 +1,4 @@
+import json
 import threading
 import logging
 import time
@@ -20,6 +21,15 @@ class HeartbeatInfo:
         self.cluster_name = cluster_name
         self.group_name = group_name
         self.weight = weight
+        # metadata is sent with every beat, so a JSON object string is parsed once here and
+        # send_heartbeat skips its own parsing; any other string is left for send_heartbeat as before
+        if isinstance(metadata, str):
+            try:
+                parsed = json.loads(metadata)
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, dict):
+                metadata = parsed
         self.metadata = metadata
         self.heartbeat_interval = heartbeat_interval
 
@@ -37,8 +47,8 @@ class HeartbeatTask(threading.Thread):
         self.stopped = False
 
     def run(self):
-        self.logger.info("[auto-beat-task] beat task start, ip:%s, port:%s, service_name:%s, group_name:%s" % (
-            self.beat_info.ip, self.beat_info.port, self.beat_info.service_name, self.beat_info.group_name))
+        self.logger.info("[auto-beat-task] beat task start, ip:%s, port:%s, service_name:%s, group_name:%s",
+                         self.beat_info.ip, self.beat_info.port, self.beat_info.service_name, self.beat_info.group_name)
         while not self.stopped:
             try:
                 self.client.send_heartbeat(self.beat_info.service_name,
@@ -51,10 +61,10 @@ class HeartbeatTask(threading.Thread):
                                            self.beat_info.group_name)
                 time.sleep(self.beat_info.heartbeat_interval)
             except Exception as e:
-                self.logger.error("[auto-beat-task] beat task error: %s" % e)
+                self.logger.error("[auto-beat-task] beat task error: %s", e)
                 time.sleep(self.beat_info.heartbeat_interval)
-        self.logger.info("[auto-beat-task] beat task stopped, ip:%s, port:%s, service_name:%s, group_name:%s" % (
-            self.beat_info.ip, self.beat_info.port, self.beat_info.service_name, self.beat_info.group_name))
+        self.logger.info("[auto-beat-task] beat task stopped, ip:%s, port:%s, service_name:%s, group_name:%s",
+                         self.beat_info.ip, self.beat_info.port, self.beat_info.service_name, self.beat_info.group_name)
 
     def stop(self):
         self.stopped = True
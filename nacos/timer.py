@@ -112,7 +112,7 @@ class NacosTimer(object):
                 self._on_exception(ex)
             if not self._ignore_ex:
                 # stop timer
-                raise ex
+                raise
         self._timer = threading.Timer(self._interval, self.scheduler, )
         self._timer.start()
 
@@ -3,7 +3,9 @@
 from __future__ import print_function
 
 import sys
+import threading
 import unittest
+from unittest import mock
 import nacos
 from nacos import files
 from nacos.listener import SubscribeListener, SimpleListenerManager
@@ -301,6 +303,74 @@ class TestClient(unittest.TestCase):
         client.stop_subscribe()
         print("subscribe has stopped")
 
+    def test_service_subscribe_reuse_timer(self):
+        client_sub = nacos.NacosClient(SERVER_ADDRESSES, namespace=NAMESPACE, username=USERNAME, password=PASSWORD)
+
+        class Share:
+            list_count = 0
+
+        def fake_list_naming_instance(*args, **kwargs):
+            Share.list_count += 1
+            return {"hosts": []}
+
+        client_sub.list_naming_instance = fake_list_naming_instance
+        fn1 = SubscribeListener(fn=lambda event, instance: None, listener_name="fn_listener1")
+        fn2 = SubscribeListener(fn=lambda event, instance: None, listener_name="fn_listener2")
+        fn3 = SubscribeListener(fn=lambda event, instance: None, listener_name="fn_listener3")
+        timer_name = "service-subscribe-timer-test.service"
+
+        # same args, the listener is added and the live timer is reused without another request
+        client_sub.subscribe(fn1, 60, "test.service")
+        timer = client_sub.subscribe_timer_manager.all_timers()[timer_name]
+        client_sub.subscribe(fn2, 60, "test.service")
+        self.assertEqual(1, Share.list_count)
+        self.assertIs(timer, client_sub.subscribe_timer_manager.all_timers()[timer_name])
+
+        # different args on a live subscription are rejected, and the listener is not added
+        with self.assertRaises(nacos.NacosException):
+            client_sub.subscribe(fn3, 60, "test.service", group_name="OTHER_GROUP")
+        self.assertEqual(1, Share.list_count)
+        listeners = client_sub.subscribed_local_manager.get_local_listener_manager("test.service").all_listeners()
+        self.assertEqual({"fn_listener1", "fn_listener2"}, set(listeners))
+
+        # stop_subscribe clears timers and args, then the service can be subscribed with new args
+        client_sub.stop_subscribe()
+        self.assertEqual(0, len(client_sub.subscribe_timer_manager.all_timers()))
+        self.assertEqual(0, len(client_sub.subscribe_args))
+        time.sleep(0.1)
+        self.assertFalse(timer.alive())
+        client_sub.subscribe(fn3, 60, "test.service", group_name="OTHER_GROUP")
+        self.assertEqual(2, Share.list_count)
+        client_sub.stop_subscribe()
+
+    def test_service_subscribe_concurrently(self):
+        client_sub = nacos.NacosClient(SERVER_ADDRESSES, namespace=NAMESPACE, username=USERNAME, password=PASSWORD)
+
+        class Share:
+            list_count = 0
+
+        def fake_list_naming_instance(*args, **kwargs):
+            Share.list_count += 1
+            time.sleep(0.3)
+            return {"hosts": []}
+
+        client_sub.list_naming_instance = fake_list_naming_instance
+        subscribe_threads = [
+            threading.Thread(target=client_sub.subscribe,
+                             args=(SubscribeListener(fn=lambda event, instance: None, listener_name="fn%s" % i),
+                                   60, "test.service"))
+            for i in range(2)]
+        for t in subscribe_threads:
+            t.start()
+        for t in subscribe_threads:
+            t.join()
+
+        self.assertEqual(1, Share.list_count)
+        timer = client_sub.subscribe_timer_manager.all_timers()["service-subscribe-timer-test.service"]
+        client_sub.stop_subscribe()
+        time.sleep(0.1)
+        self.assertFalse(timer.alive())
+
     def test_inject_version_info(self):
         headers = {}
         nacos.NacosClient._inject_version_info(headers)
@@ -335,6 +405,42 @@ class TestClient(unittest.TestCase):
         self.assertTrue("data" in params)
         self.assertTrue("signature" in params)
 
+    def test_inject_auth_info_signature(self):
+        # signatures of a fixed timestamp, computed with hmac-sha1 + base64 as nacos server verifies them
+        for hmac_digest_supported in (True, False):
+            with mock.patch("nacos.client.HMAC_DIGEST_SUPPORTED", hmac_digest_supported), \
+                    mock.patch("nacos.client.time.time", return_value=1600000000.0):
+                client_auth = nacos.NacosClient(SERVER_ADDRESSES, ak="1", sk="1")
+
+                headers = {}
+                client_auth._inject_auth_info(headers, {"tenant": "abc", "group": "bbb"}, data=None, module="config")
+                self.assertEqual("1600000000000", headers.get("timeStamp"))
+                self.assertEqual("ukVhP+yu6PUpl/h58ZoHi/DGziA=", headers.get("Spas-Signature"))
+
+                for params, sign_data, signature in (
+                        ({"serviceName": "abc", "groupName": "bbb"}, "1600000000000@@bbb@@abc",
+                         "MpF//PBgeACtAThX8lTnpf4JdzQ="),
+                        # grouped service name is signed as is
+                        ({"serviceName": "bbb@@abc", "groupName": "ccc"}, "1600000000000@@bbb@@abc",
+                         "MpF//PBgeACtAThX8lTnpf4JdzQ="),
+                        ({"serviceName": "abc", "groupName": ""}, "1600000000000@@abc",
+                         "mWhQriLZWbFh6eOtqPPFJraMiIs="),
+                ):
+                    client_auth._inject_auth_info({}, params, data=None, module="naming")
+                    self.assertEqual("1", params.get("ak"))
+                    self.assertEqual(sign_data, params.get("data"))
+                    self.assertEqual(signature, params.get("signature"))
+
+                # the cached signing key is rebuilt when sk changes
+                client_auth.sk = "2"
+                headers = {}
+                client_auth._inject_auth_info(headers, {"tenant": "abc", "group": "bbb"}, data=None, module="config")
+                self.assertEqual(b"2", client_auth._sign_key)
+                self.assertEqual("7ikeJuWGj1h5iSX4DXgHGHunvLQ=", headers.get("Spas-Signature"))
+                params = {"serviceName": "abc", "groupName": "bbb"}
+                client_auth._inject_auth_info({}, params, data=None, module="naming")
+                self.assertEqual("7OI6ufrwsg7L4W3567amo/08vtc=", params.get("signature"))
+
 
 if __name__ == '__main__':
     unittest.main()